@@ -125,3 +125,10 @@ METADATA_ASSEMBLERS: MappingProxyType[Type[T], Callable[[T, MetadataInfo], None]
     mp3.MP3: _assemble_wav_or_mp3,
 })
 
+# File types we can assemble metadata for, by extension (without the dot)
+FILE_TYPES_BY_EXT: MappingProxyType[str, Type[FileType]] = MappingProxyType({
+    'flac': flac.FLAC,
+    'opus': oggopus.OggOpus,
+    'wav': wave.WAVE,
+    'mp3': mp3.MP3,
+})
@@ -12,6 +12,7 @@ Usage:
     [--original-name][--original-metadata][--no-original][--only-original]
     [--name-format <format>][--strict-playlist][--playlist-name-format <format>]
     [--client-id <id>][--auth-token <token>][--overwrite][--no-playlist][--opus]
+    [--jobs <n>]
     
     scdl -h | --help
     scdl --version
@@ -65,49 +66,55 @@ Options:
     --strict-playlist               Abort playlist downloading if one track fails to download
     --no-playlist                   Skip downloading playlists
     --opus                          Prefer downloading opus streams over mp3 streams
+    --jobs [n]                      Number of tracks to download in parallel (default: 1)
 """
 
 import atexit
 import asyncio
+import codecs
+import concurrent.futures
 import configparser
 import contextlib
+import dataclasses
+import functools
+import hashlib
 import io
 import itertools
+import json
 import logging
 import math
 import mimetypes
 import queue
+import re
 import threading
-from typing import List, Optional, TypedDict, Tuple, IO, Union
-
-mimetypes.init()
+from typing import Dict, List, Optional, Set, TypedDict, Tuple, IO, Union
 
 import os
 import pathlib
 import shutil
 import subprocess
 import sys
+import tempfile
 import time
 import traceback
 import urllib.parse
+import uuid
 import warnings
-from dataclasses import asdict
 
 import filelock
 import mutagen
-from mutagen.easymp4 import EasyMP4
-
-EasyMP4.RegisterTextKey("website", "purl")
-
+from mutagen.id3 import ID3
 import requests
 from docopt import docopt
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathvalidate import sanitize_filename
 from soundcloud import (BasicAlbumPlaylist, BasicTrack, MiniTrack, SoundCloud,
-                        Transcoding)
+                        Transcoding, User)
 from tqdm import tqdm
 
 from scdl import __version__, utils
-from scdl.metadata_assembler import METADATA_ASSEMBLERS, MetadataInfo
+from scdl.metadata_assembler import FILE_TYPES_BY_EXT, METADATA_ASSEMBLERS, MetadataInfo
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logging.getLogger("requests").setLevel(logging.WARNING)
@@ -117,7 +124,40 @@ logger.addFilter(utils.ColorizeFilter())
 
 CHUNK_SIZE = 1024
 
-fileToKeep = []
+# Maximum number of track ids the /tracks endpoint accepts at once
+TRACKS_BATCH_SIZE = 50
+
+# Size of the reads from streaming http responses
+STREAM_CHUNK_SIZE = 256 * 1024
+# Number of chunks buffered between the http response and its consumer (~4 MiB)
+STREAM_QUEUE_SIZE = 16
+# Requested OS buffer size of the pipe feeding ffmpeg
+PIPE_BUFFER_SIZE = 1024 * 1024
+# Size of the reads from ffmpeg's stdout
+FFMPEG_READ_SIZE = 64 * 1024
+# Size of the writes when the track is downloaded to stdout
+STDOUT_COPY_SIZE = 1024 * 1024
+
+fileToKeep: Set[str] = set()
+
+# Guards the state shared between parallel track downloads
+download_state_lock = threading.Lock()
+
+# Shared session so that keep-alive connections are reused across requests
+SESSION = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    # Hand the last 5xx response back to the caller instead of raising RetryError
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+SESSION.mount("https://", _http_adapter)
+SESSION.mount("http://", _http_adapter)
 
 class SoundCloudException(Exception):
     pass
@@ -137,7 +177,8 @@ class PlaylistInfo(TypedDict):
     id: int
     title: str
 
-file_lock_dirs: List[pathlib.Path] = []
+file_lock_dirs: Set[pathlib.Path] = set()
+track_lock_paths: Set[str] = set()
 
 
 def clean_up_locks():
@@ -147,19 +188,55 @@ def clean_up_locks():
                 lock.unlink(True)
             except Exception:
                 pass
+    # The track locks are shared with other scdl processes in the temp
+    # directory, only remove the ones nobody is holding anymore
+    for lock_path in track_lock_paths:
+        try:
+            with filelock.FileLock(lock_path, timeout=0):
+                os.remove(lock_path)
+        except Exception:
+            pass
 
 
 atexit.register(clean_up_locks)
+atexit.register(SESSION.close)
 
 
 def get_filelock(path: pathlib.Path, timeout: int = 10):
-    path = pathlib.Path(path)
-    path = path.resolve()
-    file_lock_dirs.append(path.parent)
+    if not isinstance(path, pathlib.Path):
+        path = pathlib.Path(path)
+    if not path.is_absolute():
+        path = path.resolve()
+    file_lock_dirs.add(path.parent)
     lock_path = str(path) + ".scdl.lock"
     return filelock.FileLock(lock_path, timeout=timeout)
 
 
+def open_unique_file(directory, prefix: str, suffix: str, mode: str = "xb", **kwargs) -> IO:
+    """
+    Creates and opens a new file with a unique name in `directory`.
+    Unlike tempfile.mkstemp the file gets the default permissions (umask)
+    """
+    while True:
+        name = os.path.join(directory, f"{prefix}{uuid.uuid4().hex[:12]}{suffix}")
+        try:
+            return open(name, mode, **kwargs)
+        except FileExistsError:
+            continue
+
+
+def get_track_lock(track: BasicTrack):
+    """
+    Returns the lock guarding the download of a track into the current directory,
+    against parallel jobs and other scdl processes sharing its .part files.
+    It lives in the temp directory and is released by the OS if its holder dies
+    """
+    directory = hashlib.sha1(os.getcwd().encode("utf-8", "surrogateescape")).hexdigest()[:16]
+    lock_path = os.path.join(tempfile.gettempdir(), f"scdl-{directory}-{track.id}.lock")
+    track_lock_paths.add(lock_path)
+    return filelock.FileLock(lock_path, timeout=0)
+
+
 def main():
     """
     Main function, parses the URL from command line arguments
@@ -207,10 +284,9 @@ def main():
             sys.exit(1)
         config["scdl"]["client_id"] = client.client_id
         # save client_id
-        config_file.parent.mkdir(parents=True, exist_ok=True)
-        with get_filelock(config_file):
-            with open(config_file, "w", encoding="UTF-8") as f:
-                config.write(f)
+        serialized = io.StringIO()
+        config.write(serialized)
+        write_config(config_file, serialized.getvalue())
 
     if (token or arguments["me"]) and not client.is_auth_token_valid():
         if arguments["--auth-token"]:
@@ -229,6 +305,16 @@ def main():
             sys.exit(1)
         logger.debug("offset: %d", arguments["--offset"])
 
+    if arguments["--jobs"] is not None:
+        try:
+            arguments["--jobs"] = int(arguments["--jobs"])
+            if arguments["--jobs"] < 1:
+                raise ValueError()
+        except Exception:
+            logger.error("Jobs should be a positive integer...")
+            sys.exit(1)
+        logger.debug("jobs: %d", arguments["--jobs"])
+
     if arguments["--min-size"] is not None:
         try:
             arguments["--min-size"] = utils.size_in_bytes(arguments["--min-size"])
@@ -300,37 +386,53 @@ def main():
     logger.debug("Downloading to " + os.getcwd() + "...")
 
     download_url(client, **python_args)
+    flush_download_archive()
 
     if arguments["--remove"]:
         remove_files()
 
 
+# Any soundcloud.com url variant, capturing the path without query and fragment
+SOUNDCLOUD_URL_RE = re.compile(r"^(?:https?://)?(?:www\.|m\.)?soundcloud\.com(/[^?#]*)?(?:[?#].*)?$")
+
+
+def normalize_soundcloud_url(url: str) -> Optional[str]:
+    """
+    Returns the canonical https://soundcloud.com url for any soundcloud.com
+    variant (m., www., missing scheme), or None if url is not a soundcloud.com url
+    """
+    match = SOUNDCLOUD_URL_RE.match(url)
+    if match is None:
+        return None
+    return "https://soundcloud.com" + (match.group(1) or "")
+
+
 def validate_url(client: SoundCloud, url: str):
     """
     If url is a valid soundcloud.com url, return it.
     Otherwise, try to fix the url so that it is valid.
     If it cannot be fixed, exit the program.
     """
-    if url.startswith("https://m.soundcloud.com") or url.startswith("http://m.soundcloud.com") or url.startswith("m.soundcloud.com"):
-        url = url.replace("m.", "", 1)
-    if url.startswith("https://www.soundcloud.com") or url.startswith("http://www.soundcloud.com") or url.startswith("www.soundcloud.com"):
-        url = url.replace("www.", "", 1)
-    if url.startswith("soundcloud.com"):
-        url = "https://" + url
-    if url.startswith("https://soundcloud.com") or url.startswith("http://soundcloud.com"):
-        url = urllib.parse.urljoin(url, urllib.parse.urlparse(url).path)
-        return url
-    
+    normalized = normalize_soundcloud_url(url)
+    if normalized:
+        return normalized
+
     # see if link redirects to soundcloud.com
     try:
-        resp = requests.get(url)
-        if url.startswith("https://soundcloud.com") or url.startswith("http://soundcloud.com"):
-            return urllib.parse.urljoin(resp.url, urllib.parse.urlparse(resp.url).path)
+        # only the final url is needed, don't download the body
+        resp = SESSION.head(url, allow_redirects=True, timeout=10)
+        if resp.status_code >= 400:
+            # some hosts don't honor HEAD requests
+            with SESSION.get(url, allow_redirects=True, stream=True, timeout=10) as resp:
+                pass
+        normalized = normalize_soundcloud_url(resp.url)
+        if normalized:
+            return normalized
     except Exception:
         # see if given a username instead of url
         if client.resolve(f"https://soundcloud.com/{url}"):
             return f"https://soundcloud.com/{url}"
-    
+
     logger.error("URL is not valid")
     sys.exit(1)
 
@@ -342,30 +444,58 @@ def get_config(config_file: pathlib.Path) -> configparser.ConfigParser:
 
     default_config_file = pathlib.Path(__file__).with_name("scdl.cfg")
 
-    with get_filelock(config_file):
-        # load default config first
-        config.read_file(open(default_config_file, encoding="UTF-8"))
+    # load default config first
+    with open(default_config_file, encoding="UTF-8") as f:
+        config.read_file(f)
 
-        # load config file if it exists
-        if config_file.exists():
-            config.read_file(open(config_file, encoding="UTF-8"))
+    # load config file if it exists
+    current = None
+    if config_file.exists():
+        current = config_file.read_text(encoding="UTF-8")
+        config.read_string(current, source=str(config_file))
 
-        # save config to disk
-        config_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_file, "w", encoding="UTF-8") as f:
-            config.write(f)
+    # save config to disk, unless it is already up to date
+    # only the write needs to be serialized with other scdl processes
+    serialized = io.StringIO()
+    config.write(serialized)
+    if serialized.getvalue() != current:
+        write_config(config_file, serialized.getvalue())
 
     return config
 
 
+def write_config(config_file: pathlib.Path, contents: str) -> None:
+    """
+    Replaces scdl.cfg atomically, get_config reads it without taking the lock
+    """
+    config_file.parent.mkdir(parents=True, exist_ok=True)
+    with get_filelock(config_file):
+        # Replace the file a symlinked scdl.cfg points to, and keep its mode
+        # as it may be a private dotfile holding the auth_token
+        target = os.path.realpath(config_file)
+        with open_unique_file(os.path.dirname(target), ".scdl-", ".cfg", "x", encoding="UTF-8") as f:
+            f.write(contents)
+        try:
+            if os.path.exists(target):
+                shutil.copymode(target, f.name)
+            os.replace(f.name, target)
+        except OSError:
+            os.remove(f.name)
+            raise
+
+
+FS_ENCODING = sys.getfilesystemencoding()
+_fs_encode = codecs.getencoder(FS_ENCODING)
+_fs_decode = codecs.getdecoder(FS_ENCODING)
+
+
 def truncate_str(s: str, length: int) -> str:
     """
     Truncate string to a certain number of bytes using the file system encoding
     """
-    encoding = sys.getfilesystemencoding()
-    bytes = s.encode(encoding)
+    bytes = _fs_encode(s)[0]
     bytes = bytes[:length]
-    return bytes.decode(encoding, errors="ignore")
+    return _fs_decode(bytes, "ignore")[0]
 
 
 def sanitize_str(
@@ -390,6 +520,77 @@ def sanitize_str(
     return sanitized + ext
 
 
+def get_jobs(**kwargs) -> int:
+    """
+    Returns the number of tracks to download in parallel
+    """
+    # Parallel tracks would interleave into one corrupt stream on stdout
+    if is_downloading_to_stdout(**kwargs):
+        return 1
+    return kwargs.get("jobs") or 1
+
+
+class DownloadPool:
+    """
+    Runs downloads on a bounded number of worker threads.
+    With a single job, downloads run in the calling thread right away
+    """
+
+    def __init__(self, jobs: int = 1):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+        # Don't let the producer queue up more work than the workers can keep up with
+        self._slots = threading.BoundedSemaphore(jobs * 2)
+        self._futures: List[concurrent.futures.Future] = []
+
+    def submit(self, fn, *args, **kwargs) -> None:
+        if self._executor is None:
+            fn(*args, **kwargs)
+            return
+
+        self._raise_failure()
+        self._slots.acquire()
+        future = self._executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def wait(self) -> None:
+        """
+        Waits for all submitted downloads, raising the first failure
+        """
+        futures, self._futures = self._futures, []
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    def _raise_failure(self) -> None:
+        # Surface failures (e.g. --strict-playlist exits) as soon as possible
+        pending = []
+        for future in self._futures:
+            if future.done():
+                future.result()
+            else:
+                pending.append(future)
+        self._futures = pending
+
+    def __enter__(self) -> "DownloadPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        if self._executor is None:
+            return
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            for future in self._futures:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+
+
 def download_url(client: SoundCloud, **kwargs):
     """
     Detects if a URL is a track or a playlist, and parses the track(s)
@@ -411,82 +612,156 @@ def download_url(client: SoundCloud, **kwargs):
     elif item.kind == "user":
         user = item
         logger.info("Found a user profile")
-        if kwargs.get("f"):
-            logger.info(f"Retrieving all likes of user {user.username}...")
-            resources = client.get_user_likes(user.id, limit=1000)
-            for i, like in itertools.islice(enumerate(resources, 1), offset, None):
-                logger.info(f"like n°{i} of {user.likes_count}")
-                if hasattr(like, "track"):
-                    download_track(client, like.track, exit_on_fail=kwargs.get("strict_playlist"), **kwargs)
-                elif hasattr(like, "playlist"):
-                    download_playlist(client, client.get_playlist(like.playlist.id), **kwargs)
-                else:
-                    logger.error(f"Unknown like type {like}")
-                    if kwargs.get("strict_playlist"):
-                        sys.exit(1)
-            logger.info(f"Downloaded all likes of user {user.username}!")
-        elif kwargs.get("C"):
-            logger.info(f"Retrieving all commented tracks of user {user.username}...")
-            resources = client.get_user_comments(user.id, limit=1000)
-            for i, comment in itertools.islice(enumerate(resources, 1), offset, None):
-                logger.info(f"comment n°{i} of {user.comments_count}")
-                download_track(client, client.get_track(comment.track.id), exit_on_fail=kwargs.get("strict_playlist"), **kwargs)
-            logger.info(f"Downloaded all commented tracks of user {user.username}!")
-        elif kwargs.get("t"):
-            logger.info(f"Retrieving all tracks of user {user.username}...")
-            resources = client.get_user_tracks(user.id, limit=1000)
-            for i, track in itertools.islice(enumerate(resources, 1), offset, None):
-                logger.info(f"track n°{i} of {user.track_count}")
-                download_track(client, track, exit_on_fail=kwargs.get("strict_playlist"), **kwargs)
-            logger.info(f"Downloaded all tracks of user {user.username}!")
-        elif kwargs.get("a"):
-            logger.info(f"Retrieving all tracks & reposts of user {user.username}...")
-            resources = client.get_user_stream(user.id, limit=1000)
-            for i, item in itertools.islice(enumerate(resources, 1), offset, None):
-                logger.info(f"item n°{i} of {user.track_count + user.reposts_count if user.reposts_count else '?'}")
-                if item.type in ("track", "track-repost"):
-                    download_track(client, item.track, exit_on_fail=kwargs.get("strict_playlist"), **kwargs)
-                elif item.type in ("playlist", "playlist-repost"):
-                    download_playlist(client, item.playlist, **kwargs)
-                else:
-                    logger.error(f"Unknown item type {item.type}")
-                    if kwargs.get("strict_playlist"):
-                        sys.exit(1)
-            logger.info(f"Downloaded all tracks & reposts of user {user.username}!")
-        elif kwargs.get("p"):
-            logger.info(f"Retrieving all playlists of user {user.username}...")
-            resources = client.get_user_playlists(user.id, limit=1000)
-            for i, playlist in itertools.islice(enumerate(resources, 1), offset, None):
-                logger.info(f"playlist n°{i} of {user.playlist_count}")
-                download_playlist(client, playlist, **kwargs)
-            logger.info(f"Downloaded all playlists of user {user.username}!")
-        elif kwargs.get("r"):
-            logger.info(f"Retrieving all reposts of user {user.username}...")
-            resources = client.get_user_reposts(user.id, limit=1000)
-            for i, item in itertools.islice(enumerate(resources, 1), offset, None):
-                logger.info(f"item n°{i} of {user.reposts_count or '?'}")
-                if item.type == "track-repost":
-                    download_track(client, item.track, exit_on_fail=kwargs.get("strict_playlist"), **kwargs)
-                elif item.type == "playlist-repost":
-                    download_playlist(client, item.playlist, **kwargs)
-                else:
-                    logger.error(f"Unknown item type {item.type}")
-                    if kwargs.get("strict_playlist"):
-                        sys.exit(1)
-            logger.info(f"Downloaded all reposts of user {user.username}!")
-        else:
-            logger.error("Please provide a download type...")
-            sys.exit(1)
+        with DownloadPool(get_jobs(**kwargs)) as pool:
+            download_user(client, user, pool, offset, **kwargs)
     else:
         logger.error(f"Unknown item type {item.kind}")
         sys.exit(1)
 
+
+def download_user(client: SoundCloud, user: User, pool: "DownloadPool", offset: int = 0, **kwargs):
+    """
+    Downloads the tracks/playlists of a user, depending on the download type
+    """
+    if kwargs.get("f"):
+        logger.info(f"Retrieving all likes of user {user.username}...")
+        resources = client.get_user_likes(user.id, limit=1000)
+        for i, like in enumerate(itertools.islice(resources, offset, None), offset + 1):
+            logger.info(f"like n°{i} of {user.likes_count}")
+            if hasattr(like, "track"):
+                pool.submit(download_track, client, like.track, exit_on_fail=kwargs.get("strict_playlist"), **kwargs)
+            elif hasattr(like, "playlist"):
+                pool.wait()
+                download_playlist(client, client.get_playlist(like.playlist.id), **kwargs)
+            else:
+                logger.error(f"Unknown like type {like}")
+                if kwargs.get("strict_playlist"):
+                    sys.exit(1)
+        pool.wait()
+        logger.info(f"Downloaded all likes of user {user.username}!")
+    elif kwargs.get("C"):
+        logger.info(f"Retrieving all commented tracks of user {user.username}...")
+        resources = client.get_user_comments(user.id, limit=1000)
+        for i, comment in enumerate(itertools.islice(resources, offset, None), offset + 1):
+            logger.info(f"comment n°{i} of {user.comments_count}")
+            pool.submit(download_track, client, client.get_track(comment.track.id), exit_on_fail=kwargs.get("strict_playlist"), **kwargs)
+        pool.wait()
+        logger.info(f"Downloaded all commented tracks of user {user.username}!")
+    elif kwargs.get("t"):
+        logger.info(f"Retrieving all tracks of user {user.username}...")
+        resources = client.get_user_tracks(user.id, limit=1000)
+        for i, track in enumerate(itertools.islice(resources, offset, None), offset + 1):
+            logger.info(f"track n°{i} of {user.track_count}")
+            pool.submit(download_track, client, track, exit_on_fail=kwargs.get("strict_playlist"), **kwargs)
+        pool.wait()
+        logger.info(f"Downloaded all tracks of user {user.username}!")
+    elif kwargs.get("a"):
+        logger.info(f"Retrieving all tracks & reposts of user {user.username}...")
+        resources = client.get_user_stream(user.id, limit=1000)
+        for i, item in enumerate(itertools.islice(resources, offset, None), offset + 1):
+            logger.info(f"item n°{i} of {user.track_count + user.reposts_count if user.reposts_count else '?'}")
+            if item.type in ("track", "track-repost"):
+                pool.submit(download_track, client, item.track, exit_on_fail=kwargs.get("strict_playlist"), **kwargs)
+            elif item.type in ("playlist", "playlist-repost"):
+                pool.wait()
+                download_playlist(client, item.playlist, **kwargs)
+            else:
+                logger.error(f"Unknown item type {item.type}")
+                if kwargs.get("strict_playlist"):
+                    sys.exit(1)
+        pool.wait()
+        logger.info(f"Downloaded all tracks & reposts of user {user.username}!")
+    elif kwargs.get("p"):
+        logger.info(f"Retrieving all playlists of user {user.username}...")
+        resources = client.get_user_playlists(user.id, limit=1000)
+        for i, playlist in enumerate(itertools.islice(resources, offset, None), offset + 1):
+            logger.info(f"playlist n°{i} of {user.playlist_count}")
+            download_playlist(client, playlist, **kwargs)
+        logger.info(f"Downloaded all playlists of user {user.username}!")
+    elif kwargs.get("r"):
+        logger.info(f"Retrieving all reposts of user {user.username}...")
+        resources = client.get_user_reposts(user.id, limit=1000)
+        for i, item in enumerate(itertools.islice(resources, offset, None), offset + 1):
+            logger.info(f"item n°{i} of {user.reposts_count or '?'}")
+            if item.type == "track-repost":
+                pool.submit(download_track, client, item.track, exit_on_fail=kwargs.get("strict_playlist"), **kwargs)
+            elif item.type == "playlist-repost":
+                pool.wait()
+                download_playlist(client, item.playlist, **kwargs)
+            else:
+                logger.error(f"Unknown item type {item.type}")
+                if kwargs.get("strict_playlist"):
+                    sys.exit(1)
+        pool.wait()
+        logger.info(f"Downloaded all reposts of user {user.username}!")
+    else:
+        logger.error("Please provide a download type...")
+        sys.exit(1)
+
+
+def list_existing_files(path: str = ".") -> Set[str]:
+    """
+    Returns the names of the regular files in a directory, using a single scan
+    """
+    with os.scandir(path) as entries:
+        return {entry.name for entry in entries if entry.is_file()}
+
+
+# Directory listings, scanned once per directory and updated with our own writes
+_existing_files_cache: Dict[str, Set[str]] = {}
+_existing_files_lock = threading.Lock()
+
+
+def existing_files(path: str = ".") -> Set[str]:
+    """
+    Returns the cached names of the regular files in a directory
+    """
+    key = os.path.abspath(path)
+    with _existing_files_lock:
+        files = _existing_files_cache.get(key)
+        if files is None:
+            try:
+                files = list_existing_files(key)
+            except FileNotFoundError:
+                files = set()
+            _existing_files_cache[key] = files
+        return files
+
+
+def file_exists(filename: str) -> bool:
+    """
+    Checks a filename against the cached listing of its directory.
+    The listing only matches names exactly while the filesystem may not
+    (case insensitivity, unicode normalization), so misses are confirmed on disk
+    """
+    directory, name = os.path.split(filename)
+    if name in existing_files(directory or "."):
+        return True
+    if os.path.isfile(filename):
+        set_file_exists(filename)
+        return True
+    return False
+
+
+def set_file_exists(filename: str, exists: bool = True) -> None:
+    """
+    Records one of our own writes/removals in the cached directory listing
+    """
+    directory, name = os.path.split(filename)
+    files = existing_files(directory or ".")
+    with _existing_files_lock:
+        if exists:
+            files.add(name)
+        else:
+            files.discard(name)
+
+
 def remove_files():
     """
     Removes any pre-existing tracks that were not just downloaded
     """
     logger.info("Removing local track files that were not downloaded...")
-    files = [f for f in os.listdir(".") if os.path.isfile(f)]
+    files = list_existing_files()
     for f in files:
         if f not in fileToKeep:
             os.remove(f)
@@ -503,10 +778,14 @@ def sync(
     """
     logger.info("Comparing tracks...")
     archive = kwargs.get("sync")
+    flush_download_archive(archive)
     with get_filelock(archive):
         with open(archive) as f:
             try:
-                old = [int(i) for i in "".join(f.readlines()).strip().split("\n")]
+                # dict keys keep the archive order while allowing set operations
+                old = dict.fromkeys(int(line) for line in f if line.strip())
+                if not old:
+                    raise ValueError("download archive is empty")
             except IOError as ioe:
                 logger.error(f"Error trying to read download archive {archive}")
                 logger.debug(ioe)
@@ -518,9 +797,9 @@ def sync(
                 logger.debug(verr)
                 sys.exit(1)
 
-        new = [track.id for track in playlist.tracks]
-        add = set(new).difference(old)  # find tracks to download
-        rem = set(old).difference(new)  # find tracks to remove
+        new = {track.id for track in playlist.tracks}
+        add = new - old.keys()  # find tracks to download
+        rem = old.keys() - new  # find tracks to remove
 
         if not (add or rem):
             logger.info("No changes found. Exiting...")
@@ -529,23 +808,24 @@ def sync(
         if rem:
             for track_id in rem:
                 removed = False
+                track = client.get_track(track_id)
                 for ext in (".mp3", ".m4a", ".opus", ".flac", ".wav"):
                     filename = get_filename(
-                        client.get_track(track_id),
+                        track,
                         ext,
                         playlist_info=playlist_info,
                         **kwargs,
                     )
-                    if filename in os.listdir("."):
+                    if file_exists(filename):
                         removed = True
                         os.remove(filename)
+                        set_file_exists(filename, False)
                         logger.info(f"Removed {filename}")
                 if not removed:
                     logger.info(f"Could not find {filename} to remove")
             with open(archive, "w") as f:
-                for track_id in old:
-                    if track_id not in rem:
-                        f.write(str(track_id) + "\n")
+                f.writelines(f"{track_id}\n" for track_id in old if track_id not in rem)
+            reset_download_archive_cache()
         else:
             logger.info("No tracks to remove.")
 
@@ -591,26 +871,75 @@ def download_playlist(client: SoundCloud, playlist: BasicAlbumPlaylist, **kwargs
                 logger.error(f'Invalid sync archive file {kwargs.get("sync")}')
                 sys.exit(1)
 
+        offset = kwargs.get("playlist_offset", 0)
+        resolve_mini_tracks(client, playlist, offset)
+
         tracknumber_digits = len(str(len(playlist.tracks)))
-        for counter, track in itertools.islice(enumerate(playlist.tracks, 1), kwargs.get("playlist_offset", 0), None):
-            logger.debug(track)
-            logger.info(f"Track n°{counter}")
-            playlist_info["tracknumber"] = str(counter).zfill(tracknumber_digits)
-            if isinstance(track, MiniTrack):
-                if playlist.secret_token:
-                    track = client.get_tracks([track.id], playlist.id, playlist.secret_token)[0]
-                else:
-                    track = client.get_track(track.id)
-
-            download_track(client, track, playlist_info, kwargs.get("strict_playlist"), **kwargs)
+        tracks = enumerate(playlist.tracks[offset:], offset + 1)
+        with DownloadPool(get_jobs(**kwargs)) as pool:
+            for counter, track in tracks:
+                pool.submit(
+                    download_playlist_track,
+                    client, playlist, track, counter, tracknumber_digits, playlist_info, **kwargs
+                )
     finally:
         if not kwargs.get("no_playlist_folder"):
             os.chdir("..")
 
 
+def resolve_mini_tracks(client: SoundCloud, playlist: BasicAlbumPlaylist, offset: int = 0):
+    """
+    Replaces the MiniTracks of a playlist with full tracks, fetching them in batches
+    """
+    mini_ids = [track.id for track in playlist.tracks[offset:] if isinstance(track, MiniTrack)]
+    resolved = {}
+    for i in range(0, len(mini_ids), TRACKS_BATCH_SIZE):
+        batch = mini_ids[i:i + TRACKS_BATCH_SIZE]
+        if playlist.secret_token:
+            tracks = client.get_tracks(batch, playlist.id, playlist.secret_token)
+        else:
+            tracks = client.get_tracks(batch)
+        resolved.update((track.id, track) for track in tracks)
+
+    # Tracks missing from the response stay MiniTracks and get resolved one by one later
+    playlist.tracks = [
+        resolved.get(track.id, track) if isinstance(track, MiniTrack) else track
+        for track in playlist.tracks
+    ]
+
+
+def download_playlist_track(
+    client: SoundCloud,
+    playlist: BasicAlbumPlaylist,
+    track: Union[BasicTrack, MiniTrack],
+    counter: int,
+    tracknumber_digits: int,
+    playlist_info: PlaylistInfo,
+    **kwargs,
+):
+    """
+    Downloads a single track of a playlist
+    """
+    logger.debug(track)
+    logger.info(f"Track n°{counter}")
+    # Every track gets its own copy since tracks may be downloaded in parallel
+    playlist_info = dict(playlist_info, tracknumber=str(counter).zfill(tracknumber_digits))
+    if isinstance(track, MiniTrack):
+        if playlist.secret_token:
+            track = client.get_tracks([track.id], playlist.id, playlist.secret_token)[0]
+        else:
+            track = client.get_track(track.id)
+
+    download_track(client, track, playlist_info, kwargs.get("strict_playlist"), **kwargs)
+
+
 def try_utime(path, filetime):
+    follow_symlinks = os.utime not in os.supports_follow_symlinks
     try:
-        os.utime(path, (time.time(), filetime))
+        # Skip the write when the file already has the right mtime (e.g. re-runs)
+        if os.stat(path, follow_symlinks=follow_symlinks).st_mtime == filetime:
+            return
+        os.utime(path, (time.time(), filetime), follow_symlinks=follow_symlinks)
     except Exception:
         logger.error("Cannot update utime of file")
 
@@ -631,6 +960,35 @@ def get_stdout():
     return getattr(sys.stdout, 'buffer', sys.stdout)
 
 
+class DataclassFormatView(dict):
+    """
+    Mapping for str.format_map that reads dataclass fields on access,
+    instead of converting the whole object tree up front with asdict()
+    """
+
+    def __init__(self, obj, **extra):
+        super().__init__(**extra)
+        self._obj = obj
+        self._fields = {field.name for field in dataclasses.fields(obj)}
+
+    def __missing__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        return _format_view(getattr(self._obj, key))
+
+    def __repr__(self):
+        # Render like the asdict() dict, e.g. for a bare "{user}" in the template
+        return repr(dataclasses.asdict(self._obj))
+
+
+def _format_view(value):
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return DataclassFormatView(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_format_view(item) for item in value)
+    return value
+
+
 def get_filename(
     track: BasicTrack,
     ext: Optional[str] = None,
@@ -656,9 +1014,11 @@ def get_filename(
 
     if not kwargs.get("addtofile") and not kwargs.get("addtimestamp"):
         if playlist_info:
-            title = kwargs.get("playlist_name_format").format(**asdict(track), playlist=playlist_info, timestamp=timestamp)
+            title = kwargs.get("playlist_name_format").format_map(
+                DataclassFormatView(track, playlist=playlist_info, timestamp=timestamp)
+            )
         else:
-            title = kwargs.get("name_format").format(**asdict(track), timestamp=timestamp)
+            title = kwargs.get("name_format").format_map(DataclassFormatView(track, timestamp=timestamp))
 
     if original_filename is not None:
         original_filename = original_filename.encode("utf-8", "ignore").decode("utf-8")
@@ -684,7 +1044,7 @@ def download_original_file(
         logger.info("Could not get original download link")
         return None, False
 
-    r = requests.get(url, stream=True)
+    r = SESSION.get(url, stream=True)
     if r.status_code == 401:
         logger.info("The original file has no download left.")
         return None, False
@@ -709,6 +1069,7 @@ def download_original_file(
 
         # Find file extension
         mime = r.headers.get("content-type")
+        # the mimetypes database is loaded lazily by guess_extension on first use
         ext = ext or mimetypes.guess_extension(mime)
         ext = ext or ("." + r.headers.get("x-amz-meta-file-type"))
         orig_filename += ext
@@ -740,9 +1101,19 @@ def download_original_file(
     return filename, False
 
 
+# Estimated bitrates (in KB/s) of the transcodings, by preset codec
+TRANSCODING_BITRATES_KBPS = {
+    "aac": 256 / 8,
+    "mp3": 128 / 8,
+    "opus": 128 / 8,
+}
+DEFAULT_BITRATE_KBPS = 128 / 8
+
+
 def get_transcoding_m3u8(client: SoundCloud, transcoding: Transcoding, **kwargs):
     url = transcoding.url
-    bitrate_KBps = 256 / 8 if "aac" in transcoding.preset else 128 / 8
+    codec = transcoding.preset.split("_", 1)[0]
+    bitrate_KBps = TRANSCODING_BITRATES_KBPS.get(codec, DEFAULT_BITRATE_KBPS)
     total_bytes = bitrate_KBps * transcoding.duration
 
     min_size = kwargs.get("min_size") or 0
@@ -755,9 +1126,10 @@ def get_transcoding_m3u8(client: SoundCloud, transcoding: Transcoding, **kwargs)
         headers = client._get_default_headers()
         if client.auth_token:
             headers["Authorization"] = f"OAuth {client.auth_token}"
-        r = requests.get(url, params={"client_id": client.client_id}, headers=headers)
+        r = SESSION.get(url, params={"client_id": client.client_id}, headers=headers)
         logger.debug(r.url)
-        return r.json()["url"]
+        # The body is a tiny {"url": ...} object, skip requests' charset detection
+        return json.loads(r.content)["url"]
 
 
 def download_hls(
@@ -775,24 +1147,28 @@ def download_hls(
     transcodings = [t for t in track.media.transcodings if t.format.protocol == "hls"]
     to_stdout = is_downloading_to_stdout(**kwargs)
 
-    # ordered in terms of preference best -> worst
-    valid_presets = [("mp3", ".mp3")]
+    # preset name -> (preference rank, lower is better; file extension)
+    valid_presets = {"mp3": (2, ".mp3")}
 
     if not kwargs.get("onlymp3"):
         if kwargs.get("opus"):
-            valid_presets = [("opus", ".opus")] + valid_presets
-        valid_presets = [("aac", ".m4a")] + valid_presets
+            valid_presets["opus"] = (1, ".opus")
+        valid_presets["aac"] = (0, ".m4a")
 
     transcoding = None
+    preset_name = None
     ext = None
-    for preset_name, preset_ext in valid_presets:
-        for t in transcodings:
-            if t.preset.startswith(preset_name):
-                transcoding = t
-                ext = preset_ext
-        if transcoding:
-            break
-    else:
+    best_rank = math.inf
+    for t in transcodings:
+        name = t.preset.split("_", 1)[0]
+        if name not in valid_presets:
+            continue
+        rank, preset_ext = valid_presets[name]
+        # on ties the last matching transcoding wins
+        if rank <= best_rank:
+            transcoding, preset_name, ext, best_rank = t, name, preset_ext, rank
+
+    if transcoding is None:
         raise SoundCloudException(
             f"Could not find valid transcoding. Available transcodings: {[t.preset for t in track.media.transcodings if t.format.protocol == 'hls']}"
         )
@@ -819,6 +1195,14 @@ def download_hls(
     return filename, False
 
 
+@functools.lru_cache(maxsize=1)
+def get_client_user_id(client: SoundCloud, auth_token: str) -> int:
+    """
+    Returns the id of the user the auth token belongs to, fetched once per token
+    """
+    return client.get_me().id
+
+
 def download_track(
     client: SoundCloud,
     track: BasicTrack,
@@ -843,9 +1227,9 @@ def download_track(
             raise SoundCloudException(f"{title} is not available in your location...")
 
         # Get user_id from the client
-        client_user_id = client.get_me().id if client.auth_token else None
+        client_user_id = get_client_user_id(client, client.auth_token) if client.auth_token else None
 
-        lock = get_filelock(pathlib.Path(f"./{track.id}"), 0)
+        lock = get_track_lock(track)
 
         # Downloadable track
         downloaded_original = False
@@ -864,7 +1248,7 @@ def download_track(
                     )
                 downloaded_original = True
             except filelock.Timeout:
-                logger.debug(f"Could not acquire lock: {lock}. Skipping")
+                logger.info(f"Track \"{track.title}\" is already being downloaded. Skipping")
                 return
 
         if filename is None:
@@ -876,13 +1260,14 @@ def download_track(
                         client, track, title, playlist_info, **kwargs
                     )
             except filelock.Timeout:
-                logger.debug(f"Could not acquire lock: {lock}. Skipping")
+                logger.info(f"Track \"{track.title}\" is already being downloaded. Skipping")
                 return
 
-        if kwargs.get("remove"):
-            fileToKeep.append(filename)
+        with download_state_lock:
+            if kwargs.get("remove"):
+                fileToKeep.add(filename)
 
-        record_download_archive(track, **kwargs)
+            record_download_archive(track, **kwargs)
 
         to_stdout = is_downloading_to_stdout(**kwargs)
 
@@ -895,16 +1280,21 @@ def download_track(
         if not os.path.isfile(filename) and not to_stdout:
             raise SoundCloudException(f"An error occurred downloading {filename}.")
 
+        if not to_stdout:
+            set_file_exists(filename)
+
         # Add metadata to an already existing file if needed
+        # mutagen edits the file in place, only moving the data that follows the tags
         if is_already_downloaded and kwargs.get('force_metadata'):
-            with open(filename, 'rb') as f:
-                file_data = io.BytesIO(f.read())
-
-            _add_metadata_to_stream(track, file_data, playlist_info, **kwargs)
-
-            with open(filename, 'wb') as f:
-                file_data.seek(0)
-                f.write(file_data.read())
+            with open(filename, 'r+b') as f:
+                _add_metadata_to_stream(
+                    track,
+                    f,
+                    playlist_info,
+                    file_type=os.path.splitext(filename)[1][1:],
+                    skip_unchanged=True,
+                    **kwargs,
+                )
 
         # Try to change the real creation date
         if not to_stdout:
@@ -929,18 +1319,18 @@ def already_downloaded(track: BasicTrack, title: str, filename: str, **kwargs):
     """
     already_downloaded = False
 
-    if os.path.isfile(filename):
+    if file_exists(filename):
         already_downloaded = True
     if (
         kwargs.get("flac")
         and can_convert(filename)
-        and os.path.isfile(filename[:-4] + ".flac")
+        and file_exists(filename[:-4] + ".flac")
     ):
         already_downloaded = True
     if kwargs.get("download_archive") and in_download_archive(track, **kwargs):
         already_downloaded = True
 
-    if kwargs.get("flac") and can_convert(filename) and os.path.isfile(filename):
+    if kwargs.get("flac") and can_convert(filename) and file_exists(filename):
         already_downloaded = False
 
     if kwargs.get("overwrite"):
@@ -956,6 +1346,39 @@ def already_downloaded(track: BasicTrack, title: str, filename: str, **kwargs):
     return False
 
 
+# Track ids of the download archive, read once on the first lookup
+_archive_cache: Optional[Set[str]] = None
+_archive_cache_path: Optional[pathlib.Path] = None
+_archive_cache_lock = threading.Lock()
+
+
+def load_download_archive(archive_filename: pathlib.Path) -> Set[str]:
+    """
+    Returns the track ids of the download archive, reading the file only once
+    """
+    global _archive_cache, _archive_cache_path
+    with _archive_cache_lock:
+        if _archive_cache is None or _archive_cache_path != archive_filename:
+            with get_filelock(archive_filename):
+                with open(archive_filename, "a+", encoding="utf-8") as file:
+                    file.seek(0)
+                    _archive_cache = {line.strip() for line in file}
+            with _archive_flush_lock:
+                _archive_cache.update(_pending_archive_writes.get(archive_filename, ()))
+            _archive_cache_path = archive_filename
+        return _archive_cache
+
+
+def reset_download_archive_cache():
+    """
+    Forgets the cached download archive, e.g. after it was rewritten
+    """
+    global _archive_cache, _archive_cache_path
+    with _archive_cache_lock:
+        _archive_cache = None
+        _archive_cache_path = None
+
+
 def in_download_archive(track: BasicTrack, **kwargs):
     """
     Returns True if a track_id exists in the download archive
@@ -965,13 +1388,7 @@ def in_download_archive(track: BasicTrack, **kwargs):
         return
 
     try:
-        with get_filelock(archive_filename):
-            with open(archive_filename, "a+", encoding="utf-8") as file:
-                file.seek(0)
-                track_id = str(track.id)
-                for line in file:
-                    if line.strip() == track_id:
-                        return True
+        return str(track.id) in load_download_archive(archive_filename)
     except IOError as ioe:
         logger.error("Error trying to read download archive...")
         logger.error(ioe)
@@ -979,37 +1396,78 @@ def in_download_archive(track: BasicTrack, **kwargs):
     return False
 
 
+# Track ids waiting to be appended to their download archive
+_pending_archive_writes: Dict[pathlib.Path, List[str]] = {}
+_archive_flush_lock = threading.Lock()
+ARCHIVE_FLUSH_SIZE = 32
+
+
 def record_download_archive(track: BasicTrack, **kwargs):
     """
     Write the track_id in the download archive
+    Writes are batched, see flush_download_archive
     """
     archive_filename = kwargs.get("download_archive")
     if not archive_filename:
         return
 
-    try:
-        with get_filelock(archive_filename):
-            with open(archive_filename, "a", encoding="utf-8") as file:
-                file.write(f"{track.id}\n")
-    except IOError as ioe:
-        logger.error("Error trying to write to download archive...")
-        logger.error(ioe)
+    with _archive_flush_lock:
+        pending = _pending_archive_writes.setdefault(archive_filename, [])
+        pending.append(str(track.id))
+        should_flush = len(pending) >= ARCHIVE_FLUSH_SIZE
+
+    with _archive_cache_lock:
+        if _archive_cache is not None and _archive_cache_path == archive_filename:
+            _archive_cache.add(str(track.id))
+
+    if should_flush:
+        flush_download_archive(archive_filename)
+
+
+def flush_download_archive(archive_filename: Optional[pathlib.Path] = None):
+    """
+    Appends the pending track ids to the given download archive, or to all of them
+    """
+    with _archive_flush_lock:
+        archives = [archive_filename] if archive_filename else list(_pending_archive_writes)
+        for archive in archives:
+            track_ids = _pending_archive_writes.pop(archive, None)
+            if not track_ids:
+                continue
+
+            try:
+                with get_filelock(archive):
+                    with open(archive, "a", encoding="utf-8") as file:
+                        file.writelines(f"{track_id}\n" for track_id in track_ids)
+            except IOError as ioe:
+                logger.error("Error trying to write to download archive...")
+                logger.error(ioe)
+
+
+atexit.register(flush_download_archive)
 
 
-def _try_get_artwork(url: str, size: str = 'original') -> Optional[requests.Response]:
+# Only meant for covers shared by consecutive tracks (e.g. the uploader's
+# avatar), original artwork can be several MB so keep just a few around
+@functools.lru_cache(maxsize=4)
+def _fetch_artwork(url: str, size: str) -> Optional[bytes]:
+    # Network errors propagate so that they are not cached
     new_artwork_url = url.replace("large", size)
+    artwork_response = SESSION.get(new_artwork_url, allow_redirects=False, timeout=5)
 
-    try:
-        artwork_response = requests.get(new_artwork_url, allow_redirects=False, timeout=5)
+    if artwork_response.status_code != 200:
+        return None
 
-        if artwork_response.status_code != 200:
-            return None
+    content_type = artwork_response.headers.get('Content-Type', '').lower()
+    if content_type not in ('image/png', 'image/jpeg', 'image/jpg'):
+        return None
 
-        content_type = artwork_response.headers.get('Content-Type', '').lower()
-        if content_type not in ('image/png', 'image/jpeg', 'image/jpg'):
-            return None
+    return artwork_response.content
 
-        return artwork_response
+
+def _try_get_artwork(url: str, size: str = 'original') -> Optional[bytes]:
+    try:
+        return _fetch_artwork(url, size)
     except requests.RequestException:
         return None
 
@@ -1034,87 +1492,205 @@ def build_ffmpeg_encoding_args(
 
         # Progress to stderr
         '-progress', 'pipe:2',
-        '-stats_period', '0.1',
+        '-stats_period', '0.25',
 
-        # Output file
+        # Output file, we always own it
+        '-y',
         output_file
     ]
 
 
+def _feed_response_to_queue(
+    response: requests.Response,
+    chunks: queue.Queue,
+    stop: threading.Event,
+    chunk_size: int,
+) -> None:
+    """
+    Reads the response body into a bounded queue, ending with None
+    (or the exception that interrupted the download)
+    """
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        for chunk in iter(lambda: response.raw.read(chunk_size), b''):
+            if not put(chunk):
+                return
+        put(None)
+    except Exception as exc:
+        put(exc)
+
+
+def _enlarge_pipe_buffer(stream: asyncio.StreamWriter) -> None:
+    """
+    Grows the OS buffer of a pipe so that fewer write() calls are needed, Linux only
+    """
+    if not sys.platform.startswith("linux"):
+        return
+
+    import fcntl
+
+    try:
+        fd = stream.transport.get_extra_info("pipe").fileno()
+        fcntl.fcntl(fd, getattr(fcntl, "F_SETPIPE_SZ", 1031), PIPE_BUFFER_SIZE)
+    except (AttributeError, OSError) as err:
+        logger.debug(f"Could not enlarge the pipe buffer: {err}")
+
+
 async def _write_streaming_response_to_pipe(
     response: requests.Response,
-    pipe: Union[asyncio.StreamWriter, io.BytesIO],
+    pipe: Union[asyncio.StreamWriter, IO[bytes]],
+    initial_offset: int = 0,  # bytes already downloaded when resuming with a Range request
     **kwargs,
 ) -> None:
     total_length = int(response.headers.get("content-length"))
+    is_stream_writer = isinstance(pipe, asyncio.StreamWriter)
 
     min_size = kwargs.get("min_size") or 0
     max_size = kwargs.get("max_size") or math.inf  # max size of 0 treated as no max size
 
-    if not min_size <= total_length <= max_size:
+    if not min_size <= initial_offset + total_length <= max_size:
         raise SoundCloudException("File not within --min-size and --max-size bounds")
 
     logger.info('Receiving the streaming response')
     received = 0
-    chunk_size = 8192
 
     loop = asyncio.get_event_loop()
 
-    with memoryview(bytearray(chunk_size)) as buffer:
-        for chunk in tqdm(
-            iter(lambda: response.raw.read(chunk_size), b''),
-            total=(total_length / chunk_size) + 1,
-            disable=bool(kwargs.get('hide_progress')),
-            unit='Kb',
-            unit_scale=chunk_size / 1024,
-        ):
-            if not chunk:
-                break
-
-            buffer_view = buffer[:len(chunk)]
-            buffer_view[:] = chunk
+    # The response is read by a separate thread, so a slow consumer (ffmpeg
+    # flushing to disk) doesn't stall the socket until the queue is full
+    chunks = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    stop = threading.Event()
+    feeder = threading.Thread(
+        target=_feed_response_to_queue,
+        args=(response, chunks, stop, STREAM_CHUNK_SIZE),
+        daemon=True,
+    )
+    feeder.start()
 
-            received += len(chunk)
-            if isinstance(pipe, io.BytesIO):
-                pipe.write(buffer_view)
-            else:
-                await loop.run_in_executor(None, pipe.write, buffer_view)
+    try:
+        with tqdm(
+            total=initial_offset + total_length,
+            initial=initial_offset,
+            disable=bool(kwargs.get('hide_progress')),
+            unit='B',
+            unit_scale=True,
+            unit_divisor=1024,
+        ) as progress:
+            while True:
+                chunk = await loop.run_in_executor(None, chunks.get)
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+
+                received += len(chunk)
+                progress.update(len(chunk))
+                pipe.write(chunk)
+                if is_stream_writer:
+                    await pipe.drain()
+    finally:
+        stop.set()
 
     if received != total_length:
         logger.error("connection closed prematurely, download incomplete")
         sys.exit(1)
 
-    if not isinstance(pipe, io.BytesIO):
+    if is_stream_writer:
         pipe.close()
 
 
+# Separator between the artist and the title, for --extract-artist
+ARTIST_DASH_RE = re.compile(r" [-−–—―] ")
+
+_mutagen_keys_registered = False
+
+
+def _register_mutagen_keys():
+    """
+    Registers our custom tag keys, only done once metadata is actually written
+    """
+    global _mutagen_keys_registered
+    if _mutagen_keys_registered:
+        return
+
+    from mutagen.easymp4 import EasyMP4
+
+    EasyMP4.RegisterTextKey("website", "purl")
+    _mutagen_keys_registered = True
+
+
+def _load_mutagen_file(stream: IO[bytes], file_type: Optional[str] = None) -> Optional[mutagen.FileType]:
+    # Construct the known file type directly, skipping mutagen's format detection
+    file_cls = FILE_TYPES_BY_EXT.get(file_type) if file_type else None
+    if file_cls is not None:
+        try:
+            return file_cls(stream)
+        except mutagen.MutagenError:
+            # Extension doesn't match the content, let mutagen figure it out
+            stream.seek(0)
+    return mutagen.File(stream)
+
+
+def _clear_tags(mutagen_file: mutagen.FileType) -> None:
+    """Drop the tags (and embedded pictures) of `mutagen_file` in memory only"""
+    if mutagen_file.tags is not None:
+        mutagen_file.tags.clear()
+    if hasattr(mutagen_file, "clear_pictures"):
+        mutagen_file.clear_pictures()
+
+
+def _tags_digest(mutagen_file: mutagen.FileType) -> bytes:
+    """Hash of the tags and embedded pictures of `mutagen_file`, used to detect no-op retagging"""
+    digest = hashlib.sha256()
+    tags = mutagen_file.tags
+    if tags is None:
+        items = []
+    elif isinstance(tags, ID3):
+        # Frames are keyed inconsistently until saved, compare them by value
+        items = tags.values()
+    else:
+        items = tags.items()
+    for item in sorted(map(repr, items)):
+        digest.update(item.encode())
+    for picture in getattr(mutagen_file, "pictures", ()):
+        digest.update(picture.data)
+    return digest.digest()
+
+
 def _add_metadata_to_stream(
     track: BasicTrack,
-    stream: io.BytesIO,
+    stream: IO[bytes],
     playlist_info: Optional[PlaylistInfo] = None,
+    file_type: Optional[str] = None,
+    skip_unchanged: bool = False,  # check the existing tags first, for files we didn't just write
     **kwargs,
 ) -> None:
     logger.info("Applying metadata...")
+    _register_mutagen_keys()
 
     artwork_base_url = track.artwork_url or track.user.avatar_url
-    artwork_response = None
+    artwork = None
 
     if kwargs.get("original_art"):
-        artwork_response = _try_get_artwork(artwork_base_url, 'original')
+        artwork = _try_get_artwork(artwork_base_url, 'original')
 
-    if artwork_response is None:
-        artwork_response = _try_get_artwork(artwork_base_url, 't500x500')
+    if artwork is None:
+        artwork = _try_get_artwork(artwork_base_url, 't500x500')
 
     artist: str = track.user.username
     if bool(kwargs.get('extract_artist')):
-        for dash in {" - ", " − ", " – ", " — ", " ― "}:
-            if dash not in track.title:
-                continue
-
-            artist_title = track.title.split(dash, maxsplit=1)
-            artist = artist_title[0].strip()
-            track.title = artist_title[1].strip()
-            break
+        match = ARTIST_DASH_RE.search(track.title)
+        if match:
+            artist = track.title[:match.start()].strip()
+            track.title = track.title[match.end():].strip()
 
     album_available: bool = playlist_info and not kwargs.get("no_album_tag")
 
@@ -1123,7 +1699,7 @@ def _add_metadata_to_stream(
         title=track.title,
         description=track.description,
         genre=track.genre,
-        artwork_jpeg=artwork_response.content if artwork_response else None,
+        artwork_jpeg=artwork,
         link=track.permalink_url,
         date=track.created_at.strftime('%Y-%m-%d %H:%M:%S'),
         album_title=playlist_info["title"] if album_available else None,
@@ -1131,7 +1707,7 @@ def _add_metadata_to_stream(
         album_track_num=playlist_info["tracknumber"] if album_available else None,
     )
 
-    mutagen_file = mutagen.File(stream)
+    mutagen_file = _load_mutagen_file(stream, file_type)
 
     handler = METADATA_ASSEMBLERS.get(type(mutagen_file), None)
     if handler is None:
@@ -1139,9 +1715,22 @@ def _add_metadata_to_stream(
                      f'Please create an issue at https://github.com/flyingrub/scdl/issues and we will look into it')
         return
 
+    # Assemble the new tags in memory first and leave the file alone if
+    # they are identical to what is already there (--force-metadata reruns)
+    if skip_unchanged:
+        current_tags = _tags_digest(mutagen_file)
+        _clear_tags(mutagen_file)
+        handler(mutagen_file, metadata)
+        if isinstance(mutagen_file.tags, ID3):
+            mutagen_file.tags.update_to_v24()
+        if _tags_digest(mutagen_file) == current_tags:
+            logger.info("Metadata is already up to date")
+            return
+
     # Delete all the existing tags and write our own tags
     stream.seek(0)
     mutagen_file.delete(stream)
+    _clear_tags(mutagen_file)
     handler(mutagen_file, metadata)
 
     stream.seek(0)
@@ -1159,6 +1748,13 @@ def re_encode_to_out(
 ) -> None:
     to_stdout = is_downloading_to_stdout(**kwargs)
 
+    if not to_stdout:
+        if skip_re_encoding and isinstance(in_data, requests.Response):
+            download_stream_to_file(track, in_data, out_codec, filename, playlist_info, **kwargs)
+        else:
+            re_encode_to_file(track, in_data, out_codec, filename, playlist_info, **kwargs)
+        return
+
     encoded = re_encode_to_buffer(
         track,
         in_data,
@@ -1168,58 +1764,64 @@ def re_encode_to_out(
         **kwargs,
     )
 
-    out_handle = get_stdout() if to_stdout else open(filename, 'wb')
-    shutil.copyfileobj(encoded, out_handle)
+    shutil.copyfileobj(encoded, get_stdout(), STDOUT_COPY_SIZE)
 
-    if not to_stdout:
-        out_handle.close()
-
-
-def _is_ffmpeg_progress_line(parameters: List[str]):
-    return len(parameters) == 2 and parameters[0] in (
-        "progress",
-        "speed",
-        "drop_frames",
-        "dup_frames",
-        "out_time",
-        "out_time_ms",
-        "out_time_us",
-        "total_size",
-        "bitrate",
-    )
+
+FFMPEG_PROGRESS_KEYS = frozenset((
+    "progress",
+    "speed",
+    "drop_frames",
+    "dup_frames",
+    "out_time",
+    "out_time_ms",
+    "out_time_us",
+    "total_size",
+    "bitrate",
+))
 
 
 async def _re_encode_ffmpeg(
     in_data: Union[requests.Response, str],  # streaming response or url
     out_codec: str,
     track_duration_ms: int,
+    output_file: Optional[str] = None,
     **kwargs,
-) -> io.BytesIO:
+) -> Optional[io.BytesIO]:
+    """
+    Encodes the track with ffmpeg, into a buffer or straight into output_file if given
+    """
     is_url: bool = isinstance(in_data, str)
+    to_buffer: bool = output_file is None
     logger.info("Creating the ffmpeg pipe...")
 
     commands = build_ffmpeg_encoding_args(
         input_file=in_data if is_url else '-',
-        output_file='pipe:1',
+        output_file='pipe:1' if to_buffer else output_file,
         out_codec=out_codec,
     )
 
     logger.debug(f"ffmpeg command: {commands}")
     pipe = await asyncio.create_subprocess_exec(
         *commands,
-        stdin=asyncio.subprocess.PIPE,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
+        # ffmpeg fetches urls itself, only streaming responses are piped through us
+        stdin=asyncio.subprocess.DEVNULL if is_url else asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE if to_buffer else asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        # Buffer more of ffmpeg's output before the event loop pauses reading it
+        limit=PIPE_BUFFER_SIZE,
     )
 
+    if not is_url:
+        _enlarge_pipe_buffer(pipe.stdin)
+
     logger.info('Encoding..')
-    errors_output = ''
+    errors_output: List[str] = []
     stdout = io.BytesIO()
 
     # A function that reads encoded track to our `stdout` BytesIO object
     async def read_stdout():
         while True:
-            data = await pipe.stdout.read(8196)
+            data = await pipe.stdout.read(FFMPEG_READ_SIZE)
             if not data:
                 break
 
@@ -1227,7 +1829,6 @@ async def _re_encode_ffmpeg(
 
     # Read line by line from stderr and put these messages in a queue
     async def read_stderr():
-        nonlocal errors_output
         with tqdm(
                 total=track_duration_ms / 1000,
                 disable=bool(kwargs.get("hide_progress")),
@@ -1240,16 +1841,15 @@ async def _re_encode_ffmpeg(
                     break
 
                 line = line_bytes.decode('utf-8', errors='ignore')
-                parameters = line.split('=', maxsplit=1)
-                if not _is_ffmpeg_progress_line(parameters):
-                    errors_output += line
-                    continue
-
-                if not line.startswith('out_time_ms'):
+                # The only progress line we care about, check it before anything else
+                if not line.startswith('out_time_ms='):
+                    key, sep, _ = line.partition('=')
+                    if not sep or key not in FFMPEG_PROGRESS_KEYS:
+                        errors_output.append(line)
                     continue
 
                 try:
-                    seconds = int(parameters[1]) / 1_000_000
+                    seconds = int(line[len('out_time_ms='):]) / 1_000_000
                 except ValueError:
                     seconds = 0
 
@@ -1260,8 +1860,10 @@ async def _re_encode_ffmpeg(
             # We are done here
             progress.close()
 
-    tasks = [read_stdout(), read_stderr()]
-    if isinstance(in_data, requests.Response):
+    tasks = [read_stderr()]
+    if to_buffer:
+        tasks.append(read_stdout())
+    if not is_url:
         tasks.append(_write_streaming_response_to_pipe(in_data, pipe.stdin, **kwargs))
 
     await asyncio.gather(*tasks)
@@ -1269,7 +1871,10 @@ async def _re_encode_ffmpeg(
     # Make sure that process has exited and get its exit code
     await pipe.wait()
     if pipe.returncode != 0:
-        raise SoundCloudException(f'FFmpeg error({pipe.returncode}): {errors_output}')
+        raise SoundCloudException(f'FFmpeg error({pipe.returncode}): {"".join(errors_output)}')
+
+    if not to_buffer:
+        return None
 
     stdout.seek(0)
     return stdout
@@ -1277,7 +1882,13 @@ async def _re_encode_ffmpeg(
 
 def _asyncio_run(coro):
     # There's no asyncio.run in old python versions
-    return asyncio.get_event_loop().run_until_complete(coro)
+    try:
+        loop = asyncio.get_event_loop()
+    except RuntimeError:
+        # Worker threads don't have an event loop by default
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
 
 
 def _copy_stream(
@@ -1305,12 +1916,138 @@ def re_encode_to_buffer(
 
     # Remove original metadata, add our own, and we are done
     if not kwargs.get("original_metadata"):
-        _add_metadata_to_stream(track, encoded_data, playlist_info, **kwargs)
+        _add_metadata_to_stream(track, encoded_data, playlist_info, file_type=out_codec, **kwargs)
 
     encoded_data.seek(0)
     return encoded_data
 
 
+def re_encode_to_file(
+    track: BasicTrack,
+    in_data: Union[requests.Response, str],  # streaming response or url
+    out_codec: str,
+    filename: str,
+    playlist_info: Optional[PlaylistInfo] = None,
+    **kwargs,
+) -> None:
+    """
+    Encodes straight into the output file without staging the track in memory,
+    then tags it in place. The file only gets its final name once complete
+    """
+    with open_unique_file(os.path.dirname(filename) or ".", ".scdl-", ".part") as f:
+        part_filename = f.name
+    try:
+        _asyncio_run(_re_encode_ffmpeg(in_data, out_codec, track.duration, output_file=part_filename, **kwargs))
+        _finish_part_file(track, part_filename, filename, out_codec, playlist_info, **kwargs)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(part_filename)
+        raise
+
+
+def download_stream_to_file(
+    track: BasicTrack,
+    response: requests.Response,
+    out_codec: str,
+    filename: str,
+    playlist_info: Optional[PlaylistInfo] = None,
+    **kwargs,
+) -> None:
+    """
+    Downloads a streaming response straight into the output file.
+    Data is kept in a .part file until complete, an interrupted download
+    is resumed with an http Range request on the next run
+    """
+    directory = os.path.dirname(filename)
+    total_length = int(response.headers.get("content-length"))
+
+    # The part file is tied to the version of the upload it holds bytes of,
+    # so a replaced original is never appended to the previous one
+    etag = response.headers.get("ETag")
+    if etag and etag.startswith("W/"):
+        etag = None  # weak validators can't be used with If-Range
+    validator = etag or response.headers.get("Last-Modified")
+    part_filename = get_part_filename(track, filename, validator, total_length)
+    for stale in pathlib.Path(directory or ".").glob(f".scdl-{track.id}-*.part"):
+        if stale.name != os.path.basename(part_filename):
+            stale.unlink()
+
+    # Without a validator there is no telling what the part file holds
+    offset = 0
+    if validator and not kwargs.get("overwrite") and os.path.isfile(part_filename):
+        offset = os.path.getsize(part_filename)
+
+    if offset:
+        ranged = SESSION.get(
+            response.url,
+            headers={"Range": f"bytes={offset}-", "If-Range": validator},
+            stream=True,
+        )
+        if ranged.status_code == 206 and _content_range_matches(ranged, offset, total_length):
+            logger.info(f"Resuming the download at {offset} bytes")
+            response.close()
+            response = ranged
+        else:
+            # Ranges are not supported or the file changed, start over
+            ranged.close()
+            offset = 0
+
+    try:
+        with open(part_filename, "ab" if offset else "wb") as f:
+            _asyncio_run(_write_streaming_response_to_pipe(response, f, initial_offset=offset, **kwargs))
+    except SoundCloudException:
+        # Nothing worth resuming, e.g. the file is not within --min-size/--max-size
+        with contextlib.suppress(OSError):
+            os.remove(part_filename)
+        raise
+
+    # Tagging rewrites the file, so it must not be picked up for resuming anymore
+    with open_unique_file(directory or ".", ".scdl-", ".part") as f:
+        tagging_filename = f.name
+    os.replace(part_filename, tagging_filename)
+    try:
+        _finish_part_file(track, tagging_filename, filename, out_codec, playlist_info, **kwargs)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tagging_filename)
+        raise
+
+
+def get_part_filename(track: BasicTrack, filename: str, validator: Optional[str], total_length: int) -> str:
+    """
+    Returns the resumable .part file of a version of the track, next to filename
+    """
+    version = hashlib.sha1(f"{validator}/{total_length}".encode()).hexdigest()[:12]
+    return os.path.join(os.path.dirname(filename), f".scdl-{track.id}-{version}.part")
+
+
+def _content_range_matches(response: requests.Response, offset: int, total_length: int) -> bool:
+    """
+    Checks that a 206 response continues at offset a file of total_length bytes
+    """
+    match = re.fullmatch(r"bytes (\d+)-\d+/(\d+)", response.headers.get("Content-Range", "").strip())
+    return match is not None and int(match.group(1)) == offset and int(match.group(2)) == total_length
+
+
+def _finish_part_file(
+    track: BasicTrack,
+    part_filename: str,
+    filename: str,
+    out_codec: str,
+    playlist_info: Optional[PlaylistInfo] = None,
+    **kwargs,
+) -> None:
+    """
+    Tags a completely written .part file and moves it to its final name
+    """
+    # Remove original metadata, add our own, and we are done
+    if not kwargs.get("original_metadata"):
+        with open(part_filename, "r+b") as f:
+            _add_metadata_to_stream(track, f, playlist_info, file_type=out_codec, **kwargs)
+
+    os.replace(part_filename, filename)
+
+
 def is_ffmpeg_available():
     """
     Returns true if ffmpeg is available in the operating system
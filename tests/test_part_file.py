@@ -0,0 +1,104 @@
+import io
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+import pytest
+import requests
+
+from scdl import scdl
+
+BODY = bytes(range(256)) * 4
+TRACK = SimpleNamespace(id=1234)
+
+
+def make_response(body: bytes, status_code: int = 200, headers: Optional[Dict[str, str]] = None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://example.com/original.wav"
+    response.raw = io.BytesIO(body)
+    response.headers["Content-Length"] = str(len(body))
+    response.headers.update(headers or {})
+    return response
+
+
+def download(tmp_path: Path, response: requests.Response, **kwargs):
+    filename = str(tmp_path / "track.wav")
+    scdl.download_stream_to_file(
+        TRACK, response, "wav", filename, hide_progress=True, original_metadata=True, **kwargs
+    )
+    return Path(filename)
+
+
+def write_part(tmp_path: Path, data: bytes, validator: Optional[str]):
+    part = scdl.get_part_filename(TRACK, str(tmp_path / "track.wav"), validator, len(BODY))
+    Path(part).write_bytes(data)
+
+
+def part_files(tmp_path: Path):
+    return list(tmp_path.glob("*.part"))
+
+
+def test_no_validator_starts_over(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    def no_range_requests(*args, **kwargs):
+        raise AssertionError("resumed without a validator")
+
+    monkeypatch.setattr(scdl.SESSION, "get", no_range_requests)
+    write_part(tmp_path, b"x" * 300, None)
+    file = download(tmp_path, make_response(BODY))
+    assert file.read_bytes() == BODY
+    assert not part_files(tmp_path)
+
+
+def test_resume(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    requested = {}
+
+    def ranged_get(url, headers, **kwargs):
+        requested.update(headers)
+        return make_response(
+            BODY[300:], 206, {"ETag": '"v1"', "Content-Range": f"bytes 300-{len(BODY) - 1}/{len(BODY)}"}
+        )
+
+    monkeypatch.setattr(scdl.SESSION, "get", ranged_get)
+    write_part(tmp_path, BODY[:300], '"v1"')
+    file = download(tmp_path, make_response(BODY, headers={"ETag": '"v1"'}))
+    assert requested == {"Range": "bytes=300-", "If-Range": '"v1"'}
+    assert file.read_bytes() == BODY
+    assert not part_files(tmp_path)
+
+
+def test_range_not_supported(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(scdl.SESSION, "get", lambda *args, **kwargs: make_response(BODY))
+    write_part(tmp_path, b"x" * 300, '"v1"')
+    file = download(tmp_path, make_response(BODY, headers={"ETag": '"v1"'}))
+    assert file.read_bytes() == BODY
+    assert not part_files(tmp_path)
+
+
+def test_other_version_removed(tmp_path: Path):
+    write_part(tmp_path, b"x" * 300, '"v1"')
+    file = download(tmp_path, make_response(BODY, headers={"ETag": '"v2"'}))
+    assert file.read_bytes() == BODY
+    assert not part_files(tmp_path)
+
+
+def test_size_rejection_removes_part(tmp_path: Path):
+    with pytest.raises(scdl.SoundCloudException):
+        download(tmp_path, make_response(BODY, headers={"ETag": '"v1"'}), min_size=len(BODY) + 1)
+    assert not part_files(tmp_path)
+    assert not (tmp_path / "track.wav").exists()
+
+
+def test_tagging_failure_is_not_resumable(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    def failing_tagger(*args, **kwargs):
+        raise RuntimeError("tagging failed")
+
+    monkeypatch.setattr(scdl, "_add_metadata_to_stream", failing_tagger)
+    filename = str(tmp_path / "track.wav")
+    with pytest.raises(RuntimeError):
+        scdl.download_stream_to_file(
+            TRACK, make_response(BODY, headers={"ETag": '"v1"'}), "wav", filename, hide_progress=True
+        )
+    assert not part_files(tmp_path)
+    assert not os.path.exists(filename)
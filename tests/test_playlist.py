@@ -47,6 +47,22 @@ def test_playlist(tmp_path: Path):
     assert_track_playlist_2(tmp_path)
 
 
+def test_jobs(tmp_path: Path):
+    os.chdir(tmp_path)
+    r = call_scdl_with_auth(
+        "-l",
+        "https://soundcloud.com/one-thousand-and-one/sets/test-playlist/s-ZSLfNrbPoXR",
+        "--playlist-name-format",
+        "{playlist[tracknumber]}_{title}",
+        "--onlymp3",
+        "--jobs",
+        "2",
+    )
+    assert r.returncode == 0
+    assert_track_playlist_1(tmp_path)
+    assert_track_playlist_2(tmp_path)
+
+
 def test_n(tmp_path: Path):
     os.chdir(tmp_path)
     r = call_scdl_with_auth(
@@ -130,6 +146,24 @@ def test_strict_playlist(tmp_path: Path):
     assert_not_track(tmp_path / "test playlist", "2_test track 2.mp3")
 
 
+def test_strict_playlist_jobs(tmp_path: Path):
+    os.chdir(tmp_path)
+    r = call_scdl_with_auth(
+        "-l",
+        "https://soundcloud.com/one-thousand-and-one/sets/test-playlist/s-ZSLfNrbPoXR",
+        "--playlist-name-format",
+        "{playlist[tracknumber]}_{title}",
+        "--onlymp3",
+        "--max-size=10kb",
+        "--strict-playlist",
+        "--jobs",
+        "2",
+    )
+    assert r.returncode == 1
+    assert_not_track(tmp_path / "test playlist", "1_testing - test track.mp3")
+    assert_not_track(tmp_path / "test playlist", "2_test track 2.mp3")
+
+
 def test_sync(tmp_path: Path):
     os.chdir(tmp_path)
     os.makedirs("test playlist")
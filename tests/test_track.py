@@ -205,6 +205,21 @@ def test_force_metadata(tmp_path: Path):
     assert r.returncode == 0
     assert_track(tmp_path, "track.wav", "copy", "saves", None)
 
+    # Rerunning with up to date metadata leaves the file untouched
+    file = tmp_path / "track.wav"
+    mtime = file.stat().st_mtime_ns
+    data = file.read_bytes()
+    r = call_scdl_with_auth(
+        "-l",
+        "https://soundcloud.com/57v/original",
+        "--name-format",
+        "track",
+        "--force-metadata",
+    )
+    assert r.returncode == 0
+    assert file.stat().st_mtime_ns == mtime
+    assert file.read_bytes() == data
+
 
 def test_addtimestamp(tmp_path: Path):
     os.chdir(tmp_path)
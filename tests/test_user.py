@@ -22,6 +22,22 @@ def test_all(tmp_path: Path):
     assert count_files(tmp_path) == 3
 
 
+def test_all_jobs(tmp_path: Path):
+    os.chdir(tmp_path)
+    r = call_scdl_with_auth(
+        "-l",
+        "https://soundcloud.com/one-thousand-and-one",
+        "-a",
+        "-o",
+        "3",
+        "--onlymp3",
+        "--jobs",
+        "2",
+    )
+    assert r.returncode == 0
+    assert count_files(tmp_path) == 3
+
+
 def test_tracks(tmp_path: Path):
     os.chdir(tmp_path)
     r = call_scdl_with_auth(